@@ -230,6 +230,17 @@ qwen_ctx_t *qwen_load(const char *model_dir) {
         return NULL;
     }
 
+    /* Load tokenizer once here so transcription calls don't pay for
+     * parsing vocab.json before the first token. */
+    char vocab_path[1024];
+    snprintf(vocab_path, sizeof(vocab_path), "%s/vocab.json", model_dir);
+    ctx->tokenizer = qwen_tokenizer_load(vocab_path);
+    if (!ctx->tokenizer) {
+        fprintf(stderr, "qwen_load: failed to load tokenizer\n");
+        qwen_free(ctx);
+        return NULL;
+    }
+
     /* Default transcription mode: full-audio offline decode (no splitting). */
     ctx->segment_sec = 0.0f;
     ctx->search_sec = 3.0f;
@@ -315,6 +326,8 @@ void qwen_free(qwen_ctx_t *ctx) {
     free(ctx->prompt_tokens);
     free(ctx->force_prompt_tokens);
 
+    qwen_tokenizer_free((qwen_tokenizer_t *)ctx->tokenizer);
+
     /* Close safetensors */
     if (ctx->safetensors) {
         multi_safetensors_close((multi_safetensors_t *)ctx->safetensors);
@@ -865,16 +878,8 @@ char *qwen_transcribe_audio(qwen_ctx_t *ctx, const float *samples, int n_samples
         fprintf(stderr, "Audio: %d samples (%.1f seconds)\n",
                 audio_n_samples, (float)audio_n_samples / QWEN_SAMPLE_RATE);
 
-    /* Load tokenizer once for all segments */
-    char vocab_path[1024];
-    snprintf(vocab_path, sizeof(vocab_path), "%s/vocab.json", ctx->model_dir);
-    qwen_tokenizer_t *tokenizer = qwen_tokenizer_load(vocab_path);
-    if (!tokenizer) {
-        free(compacted_samples);
-        return NULL;
-    }
+    qwen_tokenizer_t *tokenizer = (qwen_tokenizer_t *)ctx->tokenizer;
     if (prepare_prompt_tokens(ctx, tokenizer) != 0) {
-        qwen_tokenizer_free(tokenizer);
         free(compacted_samples);
         return NULL;
     }
@@ -890,7 +895,6 @@ char *qwen_transcribe_audio(qwen_ctx_t *ctx, const float *samples, int n_samples
     /* No splitting if segment_sec is 0 or audio fits in one segment */
     if (ctx->segment_sec <= 0 || audio_n_samples <= target_samples + margin_samples) {
         char *text = transcribe_segment(ctx, audio_samples, audio_n_samples, tokenizer, NULL, 0, NULL);
-        qwen_tokenizer_free(tokenizer);
         free(compacted_samples);
         return text;
     }
@@ -1047,7 +1051,6 @@ char *qwen_transcribe_audio(qwen_ctx_t *ctx, const float *samples, int n_samples
 
     ctx->token_cb = saved_cb;
     ctx->token_cb_userdata = saved_cb_userdata;
-    qwen_tokenizer_free(tokenizer);
     free(compacted_samples);
     return result;
 }
@@ -1342,16 +1345,8 @@ static char *stream_impl(qwen_ctx_t *ctx, const float *samples, int n_samples,
                     ctx->past_text_conditioning ? "on" : "off");
     }
 
-    /* Load tokenizer */
-    char vocab_path[1024];
-    snprintf(vocab_path, sizeof(vocab_path), "%s/vocab.json", ctx->model_dir);
-    qwen_tokenizer_t *tokenizer = qwen_tokenizer_load(vocab_path);
-    if (!tokenizer) {
-        free(compacted_samples);
-        return NULL;
-    }
+    qwen_tokenizer_t *tokenizer = (qwen_tokenizer_t *)ctx->tokenizer;
     if (prepare_prompt_tokens(ctx, tokenizer) != 0) {
-        qwen_tokenizer_free(tokenizer);
         free(compacted_samples);
         return NULL;
     }
@@ -1365,13 +1360,11 @@ static char *stream_impl(qwen_ctx_t *ctx, const float *samples, int n_samples,
             fprintf(stderr, "Streaming: no token callback, using direct final refinement\n");
         }
         if (audio_n_samples > INT_MAX) {
-            qwen_tokenizer_free(tokenizer);
             free(compacted_samples);
             return NULL;
         }
         char *text = transcribe_segment(ctx, audio_samples, (int)audio_n_samples,
                                         tokenizer, NULL, 0, NULL);
-        qwen_tokenizer_free(tokenizer);
         free(compacted_samples);
         return text;
     }
@@ -1398,7 +1391,6 @@ static char *stream_impl(qwen_ctx_t *ctx, const float *samples, int n_samples,
         free(stable_text_tokens);
         free(emitted_text_tokens);
         free(result);
-        qwen_tokenizer_free(tokenizer);
         free(compacted_samples);
         return NULL;
     }
@@ -1411,7 +1403,6 @@ static char *stream_impl(qwen_ctx_t *ctx, const float *samples, int n_samples,
         free(stable_text_tokens);
         free(emitted_text_tokens);
         free(result);
-        qwen_tokenizer_free(tokenizer);
         free(compacted_samples);
         return NULL;
     }
@@ -2137,7 +2128,6 @@ static char *stream_impl(qwen_ctx_t *ctx, const float *samples, int n_samples,
     free(raw_tokens);
     free(stable_text_tokens);
     free(emitted_text_tokens);
-    qwen_tokenizer_free(tokenizer);
     free(compacted_samples);
     free(local_samples);
 
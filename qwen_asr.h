@@ -183,6 +183,7 @@ typedef struct {
     /* Model files (kept open for mmap) */
     void *safetensors;         /* multi_safetensors_t* */
     char model_dir[512];
+    void *tokenizer;           /* qwen_tokenizer_t*, loaded once in qwen_load() */
 
     /* KV cache for decoder */
     float *kv_cache_k;         /* [layers, max_seq, kv_heads * head_dim] */
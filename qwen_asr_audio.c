@@ -18,6 +18,11 @@
 #include <string.h>
 #include <math.h>
 #include <limits.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <pthread.h>
 
 #ifndef M_PI
 #define M_PI 3.14159265358979323846
@@ -29,6 +34,7 @@
 #define WIN_LENGTH   400
 #define N_FFT        400
 #define N_FREQ       (N_FFT / 2 + 1)    /* 201 bins */
+#define MEL_BLOCK    256                /* STFT frames per matmul block */
 
 /* ========================================================================
  * WAV File Loading (adapted from voxtral)
@@ -37,16 +43,158 @@
 static uint16_t read_u16(const uint8_t *p) { return p[0] | (p[1] << 8); }
 static uint32_t read_u32(const uint8_t *p) { return p[0] | (p[1] << 8) | (p[2] << 16) | (p[3] << 24); }
 
-float *qwen_parse_wav_buffer(const uint8_t *data, size_t file_size, int *out_n_samples) {
-    if (file_size < 44 || memcmp(data, "RIFF", 4) != 0 || memcmp(data + 8, "WAVE", 4) != 0) {
-        fprintf(stderr, "parse_wav_buffer: not a valid WAV file\n");
+/* Convert interleaved s16le PCM to mono float32 in [-1,1].
+ * Mono and stereo get dedicated straight-line loops the compiler can
+ * vectorize; other channel counts fall back to a generic average. */
+static void s16le_to_mono_f32(float *dst, const uint8_t *src, int n_frames, int channels) {
+    const float scale = 1.0f / 32768.0f;
+    if (channels == 1) {
+        for (int i = 0; i < n_frames; i++) {
+            int16_t v;
+            memcpy(&v, src + (size_t)i * 2, sizeof(v));
+            dst[i] = (float)v * scale;
+        }
+    } else if (channels == 2) {
+        const float half = 0.5f * scale;
+        for (int i = 0; i < n_frames; i++) {
+            int16_t l, r;
+            memcpy(&l, src + (size_t)i * 4, sizeof(l));
+            memcpy(&r, src + (size_t)i * 4 + 2, sizeof(r));
+            dst[i] = ((float)l + (float)r) * half;
+        }
+    } else {
+        const float inv = scale / (float)channels;
+        for (int i = 0; i < n_frames; i++) {
+            const uint8_t *frame = src + (size_t)i * channels * 2;
+            float sum = 0;
+            for (int c = 0; c < channels; c++) {
+                int16_t v;
+                memcpy(&v, frame + c * 2, sizeof(v));
+                sum += v;
+            }
+            dst[i] = sum * inv;
+        }
+    }
+}
+
+/* I0 (modified Bessel, first kind, order 0) via power series,
+ * converges fast for the small arguments used by the Kaiser window. */
+static double bessel_i0(double x) {
+    double sum = 1.0, term = 1.0, xx = x * x;
+    for (int k = 1; k <= 20; k++) {
+        term *= xx / (4.0 * (double)k * (double)k);
+        sum += term;
+    }
+    return sum;
+}
+
+static int gcd_int(int a, int b) {
+    while (b) { int t = a % b; a = b; b = t; }
+    return a;
+}
+
+/* Resample mono audio to 16kHz — windowed-sinc interpolation with Kaiser
+ * window for proper anti-aliasing when downsampling.
+ *
+ * Output sample i sits at source position i * down / up, where up/down is
+ * the reduced 16000/sample_rate ratio. That position only ever has 'up'
+ * distinct fractional parts, so the Kaiser-windowed sinc taps are computed
+ * once per phase into a table (pre-normalized by their sum, which handles
+ * edge effects at boundaries) instead of once per output sample. The
+ * integer center and phase are advanced incrementally, and only outputs
+ * whose taps straddle the signal edges need bounds checks. */
+static float *resample_to_16k(const float *samples, int n_frames, int sample_rate,
+                              int *out_n_samples) {
+    enum { SINC_HALF = 16,             /* zero-crossings per side */
+           N_TAPS = 2 * SINC_HALF };
+    const double KAISER_BETA = 6.0;    /* sidelobe suppression */
+
+    int g = gcd_int(SAMPLE_RATE, sample_rate);
+    int up = SAMPLE_RATE / g;          /* number of distinct phases */
+    int down = sample_rate / g;
+    int new_n = (int)((long long)n_frames * SAMPLE_RATE / sample_rate);
+
+    /* Cutoff at the lower Nyquist to prevent aliasing */
+    double ratio = (double)SAMPLE_RATE / (double)sample_rate;
+    double cutoff = (ratio < 1.0) ? ratio : 1.0;
+    double inv_I0_beta = 1.0 / bessel_i0(KAISER_BETA);
+
+    float *resampled = (float *)malloc((size_t)(new_n > 0 ? new_n : 1) * sizeof(float));
+    float *coeffs = (float *)malloc((size_t)up * N_TAPS * sizeof(float));
+    if (!resampled || !coeffs) {
+        free(resampled); free(coeffs);
         return NULL;
     }
 
-    int channels = 0, sample_rate = 0, bits_per_sample = 0;
-    int audio_format = 0;
-    const uint8_t *pcm_data = NULL;
-    int pcm_size = 0;
+    for (int ph = 0; ph < up; ph++) {
+        double frac = (double)ph / (double)up;
+        double taps[N_TAPS];
+        double wsum = 0.0;
+        for (int t = 0; t < N_TAPS; t++) {
+            double d = (double)(t - SINC_HALF + 1) - frac; /* distance in source samples */
+            double x = d * cutoff;                        /* scale by cutoff */
+
+            /* Sinc value */
+            double s = (fabs(x) < 1e-9) ? 1.0 : sin(M_PI * x) / (M_PI * x);
+
+            /* Kaiser window over the support [-SINC_HALF, SINC_HALF] */
+            double npos = d / SINC_HALF;  /* normalized to [-1, 1] */
+            double w = 0.0;
+            if (npos > -1.0 && npos < 1.0)
+                w = bessel_i0(KAISER_BETA * sqrt(1.0 - npos * npos)) * inv_I0_beta;
+
+            taps[t] = s * w * cutoff;
+            wsum += taps[t];
+        }
+        double norm = (wsum > 1e-9) ? 1.0 / wsum : 0.0;
+        for (int t = 0; t < N_TAPS; t++)
+            coeffs[(size_t)ph * N_TAPS + t] = (float)(taps[t] * norm);
+    }
+
+    int step_int = down / up, step_frac = down % up;
+    int center = 0, ph = 0;
+    for (int i = 0; i < new_n; i++) {
+        const float *c = coeffs + (size_t)ph * N_TAPS;
+        int j0 = center - SINC_HALF + 1;
+        float acc = 0.0f;
+        if (j0 >= 0 && j0 + N_TAPS <= n_frames) {
+            const float *src = samples + j0;
+            for (int t = 0; t < N_TAPS; t++) acc += src[t] * c[t];
+        } else {
+            for (int t = 0; t < N_TAPS; t++) {
+                int j = j0 + t;
+                if (j >= 0 && j < n_frames) acc += samples[j] * c[t];
+            }
+        }
+        resampled[i] = acc;
+
+        center += step_int;
+        ph += step_frac;
+        if (ph >= up) { ph -= up; center++; }
+    }
+
+    free(coeffs);
+    *out_n_samples = new_n;
+    return resampled;
+}
+
+typedef struct {
+    int audio_format;
+    int channels;
+    int sample_rate;
+    int bits_per_sample;
+    const uint8_t *pcm_data;
+    int pcm_size;
+} wav_info_t;
+
+/* Locate the fmt and data chunks of an in-memory WAV file.
+ * Returns 0 on success, -1 if the file is not 16-bit PCM WAV. */
+static int parse_wav_header(const uint8_t *data, size_t file_size, wav_info_t *wi) {
+    memset(wi, 0, sizeof(*wi));
+    if (file_size < 44 || memcmp(data, "RIFF", 4) != 0 || memcmp(data + 8, "WAVE", 4) != 0) {
+        fprintf(stderr, "parse_wav_buffer: not a valid WAV file\n");
+        return -1;
+    }
 
     const uint8_t *p = data + 12;
     const uint8_t *end = data + file_size;
@@ -55,110 +203,65 @@ float *qwen_parse_wav_buffer(const uint8_t *data, size_t file_size, int *out_n_s
         uint32_t chunk_size = read_u32(p + 4);
         if (p + 8 + chunk_size > end) break;
         if (memcmp(p, "fmt ", 4) == 0 && chunk_size >= 16) {
-            audio_format = read_u16(p + 8);
-            channels = read_u16(p + 10);
-            sample_rate = read_u32(p + 12);
-            bits_per_sample = read_u16(p + 22);
+            wi->audio_format = read_u16(p + 8);
+            wi->channels = read_u16(p + 10);
+            wi->sample_rate = read_u32(p + 12);
+            wi->bits_per_sample = read_u16(p + 22);
         } else if (memcmp(p, "data", 4) == 0) {
-            pcm_data = p + 8;
-            pcm_size = chunk_size;
-            if (pcm_data + pcm_size > end) pcm_size = (int)(end - pcm_data);
+            wi->pcm_data = p + 8;
+            wi->pcm_size = chunk_size;
+            if (wi->pcm_data + wi->pcm_size > end) wi->pcm_size = (int)(end - wi->pcm_data);
         }
         p += 8 + chunk_size;
         if (chunk_size & 1) p++;
     }
 
-    if (audio_format != 1 || bits_per_sample != 16 || pcm_data == NULL || channels < 1) {
+    if (wi->audio_format != 1 || wi->bits_per_sample != 16 || wi->pcm_data == NULL ||
+        wi->channels < 1) {
         fprintf(stderr, "parse_wav_buffer: unsupported format (need 16-bit PCM, got fmt=%d bits=%d)\n",
-                audio_format, bits_per_sample);
-        return NULL;
+                wi->audio_format, wi->bits_per_sample);
+        return -1;
+    }
+    return 0;
+}
+
+/* Convert n_frames mono s16le samples stored at the start of buf to float32
+ * in place: the buffer is resized to hold n_frames floats and walked
+ * backwards. Float i overwrites the bytes of int16 samples 2i and 2i+1,
+ * which (for i > 0) have already been converted by then.
+ * Returns the converted buffer, or NULL (buf freed) on allocation failure. */
+static float *s16le_to_f32_inplace(uint8_t *buf, int n_frames) {
+    uint8_t *tmp = (uint8_t *)realloc(buf, (size_t)(n_frames > 0 ? n_frames : 1) * sizeof(float));
+    if (!tmp) { free(buf); return NULL; }
+    float *samples = (float *)tmp;
+    for (int i = n_frames - 1; i >= 0; i--) {
+        int16_t v;
+        memcpy(&v, tmp + (size_t)i * 2, sizeof(v));
+        samples[i] = v / 32768.0f;
     }
+    return samples;
+}
+
+float *qwen_parse_wav_buffer(const uint8_t *data, size_t file_size, int *out_n_samples) {
+    wav_info_t wi;
+    if (parse_wav_header(data, file_size, &wi) != 0) return NULL;
+    int channels = wi.channels;
+    int sample_rate = wi.sample_rate;
+    const uint8_t *pcm_data = wi.pcm_data;
+    int pcm_size = wi.pcm_size;
 
     int n_frames = pcm_size / (channels * 2);
     float *samples = (float *)malloc(n_frames * sizeof(float));
     if (!samples) return NULL;
 
-    const int16_t *src = (const int16_t *)pcm_data;
-    for (int i = 0; i < n_frames; i++) {
-        if (channels == 1) {
-            samples[i] = src[i] / 32768.0f;
-        } else {
-            float sum = 0;
-            for (int c = 0; c < channels; c++) {
-                int16_t val;
-                memcpy(&val, &src[i * channels + c], sizeof(int16_t));
-                sum += val;
-            }
-            samples[i] = (sum / channels) / 32768.0f;
-        }
-    }
+    s16le_to_mono_f32(samples, pcm_data, n_frames, channels);
 
-    /* Resample to 16kHz if needed — windowed-sinc interpolation with
-     * Kaiser window for proper anti-aliasing when downsampling. */
+    /* Resample to 16kHz if needed */
     if (sample_rate != SAMPLE_RATE) {
-        int new_n = (int)((long long)n_frames * SAMPLE_RATE / sample_rate);
-        float *resampled = (float *)malloc(new_n * sizeof(float));
-        if (!resampled) { free(samples); return NULL; }
-
-        /* Sinc resampler parameters */
-        const int SINC_HALF = 16;          /* zero-crossings per side */
-        const double KAISER_BETA = 6.0;    /* sidelobe suppression */
-        /* Cutoff at the lower Nyquist to prevent aliasing */
-        double ratio = (double)SAMPLE_RATE / (double)sample_rate;
-        double cutoff = (ratio < 1.0) ? ratio : 1.0;
-
-        /* Precompute Kaiser window: I0(beta * sqrt(1 - (n/N)^2)) / I0(beta)
-         * I0 approximation via power series (converges fast for beta <= 10). */
-        /* I0 (modified Bessel, first kind, order 0) */
-        #define BESSEL_I0(x) ({ \
-            double _sum = 1.0, _term = 1.0, _xx = (x)*(x); \
-            for (int _k = 1; _k <= 20; _k++) { \
-                _term *= _xx / (4.0 * (double)_k * (double)_k); \
-                _sum += _term; \
-            } \
-            _sum; })
-        double inv_I0_beta = 1.0 / BESSEL_I0(KAISER_BETA);
-
-        for (int i = 0; i < new_n; i++) {
-            double src_pos = (double)i / ratio;
-            int center = (int)src_pos;
-            double acc = 0.0;
-            double wsum = 0.0;
-
-            int j_lo = center - SINC_HALF + 1;
-            int j_hi = center + SINC_HALF;
-            for (int j = j_lo; j <= j_hi; j++) {
-                double d = (double)j - src_pos;        /* distance in source samples */
-                double x = d * cutoff;                  /* scale by cutoff */
-
-                /* Sinc value */
-                double s;
-                if (fabs(x) < 1e-9) {
-                    s = 1.0;
-                } else {
-                    s = sin(M_PI * x) / (M_PI * x);
-                }
-
-                /* Kaiser window over the support [-SINC_HALF, SINC_HALF] */
-                double npos = d / SINC_HALF;  /* normalized to [-1, 1] */
-                double w;
-                if (npos <= -1.0 || npos >= 1.0) {
-                    w = 0.0;
-                } else {
-                    w = BESSEL_I0(KAISER_BETA * sqrt(1.0 - npos * npos)) * inv_I0_beta;
-                }
-
-                double coeff = s * w * cutoff;
-                if (j >= 0 && j < n_frames) {
-                    acc += samples[j] * coeff;
-                }
-                wsum += coeff;
-            }
-            /* Normalize to handle edge effects at boundaries */
-            resampled[i] = (wsum > 1e-9) ? (float)(acc / wsum) : 0.0f;
-        }
-        #undef BESSEL_I0
+        int new_n = 0;
+        float *resampled = resample_to_16k(samples, n_frames, sample_rate, &new_n);
         free(samples);
+        if (!resampled) return NULL;
         samples = resampled;
         n_frames = new_n;
     }
@@ -167,23 +270,25 @@ float *qwen_parse_wav_buffer(const uint8_t *data, size_t file_size, int *out_n_s
     return samples;
 }
 
+/* The file is mmapped and parsed in place rather than copied into a
+ * heap buffer first: samples are converted straight from the page cache. */
 float *qwen_load_wav(const char *path, int *out_n_samples) {
-    FILE *f = fopen(path, "rb");
-    if (!f) {
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) {
         fprintf(stderr, "qwen_load_wav: cannot open %s\n", path);
         return NULL;
     }
-    fseek(f, 0, SEEK_END);
-    long file_size = ftell(f);
-    if (file_size <= 0) { fclose(f); return NULL; }
-    fseek(f, 0, SEEK_SET);
-    uint8_t *data = (uint8_t *)malloc(file_size);
-    if (!data || fread(data, 1, file_size, f) != (size_t)file_size) {
-        fclose(f); free(data); return NULL;
-    }
-    fclose(f);
-    float *samples = qwen_parse_wav_buffer(data, (size_t)file_size, out_n_samples);
-    free(data);
+    struct stat st;
+    if (fstat(fd, &st) < 0 || st.st_size <= 0) { close(fd); return NULL; }
+    size_t file_size = (size_t)st.st_size;
+    void *data = mmap(NULL, file_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (data == MAP_FAILED) {
+        fprintf(stderr, "qwen_load_wav: cannot mmap %s\n", path);
+        return NULL;
+    }
+    float *samples = qwen_parse_wav_buffer((const uint8_t *)data, file_size, out_n_samples);
+    munmap(data, file_size);
     return samples;
 }
 
@@ -212,19 +317,28 @@ float *qwen_read_pcm_stdin(int *out_n_samples) {
     if (memcmp(buf, "RIFF", 4) == 0) {
         if (qwen_verbose >= 2)
             fprintf(stderr, "Detected WAV format on stdin\n");
-        float *samples = qwen_parse_wav_buffer(buf, size, out_n_samples);
-        free(buf);
+        wav_info_t wi;
+        if (parse_wav_header(buf, size, &wi) != 0) { free(buf); return NULL; }
+        if (wi.channels != 1 || wi.sample_rate != SAMPLE_RATE) {
+            float *samples = qwen_parse_wav_buffer(buf, size, out_n_samples);
+            free(buf);
+            return samples;
+        }
+        /* Already 16kHz mono: move the PCM payload to the front and
+         * convert it in place, no second buffer needed. */
+        int n_frames = wi.pcm_size / 2;
+        memmove(buf, wi.pcm_data, (size_t)n_frames * 2);
+        float *samples = s16le_to_f32_inplace(buf, n_frames);
+        if (!samples) return NULL;
+        *out_n_samples = n_frames;
         return samples;
     }
     /* Raw s16le 16kHz mono */
     if (qwen_verbose >= 2)
         fprintf(stderr, "Treating stdin as raw s16le 16kHz mono\n");
     int n_frames = (int)(size / 2);
-    float *samples = (float *)malloc(n_frames * sizeof(float));
-    if (!samples) { free(buf); return NULL; }
-    const int16_t *src = (const int16_t *)buf;
-    for (int i = 0; i < n_frames; i++) samples[i] = src[i] / 32768.0f;
-    free(buf);
+    float *samples = s16le_to_f32_inplace(buf, n_frames);
+    if (!samples) return NULL;
     *out_n_samples = n_frames;
     return samples;
 }
@@ -286,6 +400,34 @@ static float *build_mel_filters(void) {
     return filters;
 }
 
+/* Mel filters, Hann window and DFT table only depend on the fixed STFT
+ * parameters, so they are built once and shared by every call (streaming
+ * computes a mel spectrogram for each chunk). */
+static float *mel_filters_table = NULL;   /* [N_MEL, N_FREQ] */
+static float *dft_table = NULL;           /* [2 * N_FREQ, N_FFT] */
+static float hann_window[WIN_LENGTH];
+static pthread_once_t mel_tables_once = PTHREAD_ONCE_INIT;
+
+static void mel_tables_init(void) {
+    /* Periodic Hann window */
+    for (int i = 0; i < WIN_LENGTH; i++)
+        hann_window[i] = 0.5f * (1.0f - cosf(2.0f * (float)M_PI * (float)i / (float)WIN_LENGTH));
+
+    /* DFT table: rows [0, N_FREQ) hold cos, rows [N_FREQ, 2*N_FREQ) hold
+     * sin, so one matmul yields re and im. */
+    float *dft = (float *)malloc((size_t)2 * N_FREQ * N_FFT * sizeof(float));
+    if (!dft) return;
+    for (int k = 0; k < N_FREQ; k++) {
+        for (int n = 0; n < N_FFT; n++) {
+            float angle = 2.0f * (float)M_PI * (float)k * (float)n / (float)N_FFT;
+            dft[(size_t)k * N_FFT + n] = cosf(angle);
+            dft[(size_t)(N_FREQ + k) * N_FFT + n] = sinf(angle);
+        }
+    }
+    dft_table = dft;
+    mel_filters_table = build_mel_filters();
+}
+
 /* ========================================================================
  * Mel Spectrogram (dynamic max, returns [128, n_frames])
  * ======================================================================== */
@@ -316,55 +458,53 @@ float *qwen_mel_spectrogram(const float *samples, int n_samples, int *out_frames
         return NULL;
     }
 
-    float *mel_filters = build_mel_filters();
-    if (!mel_filters) { free(padded); return NULL; }
-
-    /* Periodic Hann window */
-    float window[WIN_LENGTH];
-    for (int i = 0; i < WIN_LENGTH; i++)
-        window[i] = 0.5f * (1.0f - cosf(2.0f * (float)M_PI * (float)i / (float)WIN_LENGTH));
-
-    /* Precompute DFT tables */
-    float *dft_cos = (float *)malloc((size_t)N_FREQ * N_FFT * sizeof(float));
-    float *dft_sin = (float *)malloc((size_t)N_FREQ * N_FFT * sizeof(float));
-    for (int k = 0; k < N_FREQ; k++) {
-        for (int n = 0; n < N_FFT; n++) {
-            float angle = 2.0f * (float)M_PI * (float)k * (float)n / (float)N_FFT;
-            dft_cos[k * N_FFT + n] = cosf(angle);
-            dft_sin[k * N_FFT + n] = sinf(angle);
-        }
-    }
+    pthread_once(&mel_tables_once, mel_tables_init);
+    if (!mel_filters_table || !dft_table) { free(padded); return NULL; }
+    const float *mel_filters = mel_filters_table;
+    const float *window = hann_window;
+    const float *dft = dft_table;
 
     /* First pass: compute mel values and find global max.
-     * Store as [n_frames, N_MEL] temporarily for convenient max search. */
+     * Store as [n_frames, N_MEL] temporarily for convenient max search.
+     * Frames are windowed MEL_BLOCK at a time; the DFT and the mel filter
+     * projection are each a single matmul per block instead of per-frame
+     * dot products. */
     float *mel_tmp = (float *)calloc(n_frames * N_MEL, sizeof(float));
-    float windowed[N_FFT];
-    float power[N_FREQ];
+    float *windowed = (float *)malloc((size_t)MEL_BLOCK * N_FFT * sizeof(float));
+    float *spec = (float *)malloc((size_t)MEL_BLOCK * 2 * N_FREQ * sizeof(float));
+    float *power = (float *)malloc((size_t)MEL_BLOCK * N_FREQ * sizeof(float));
+    if (!mel_tmp || !windowed || !spec || !power) {
+        free(mel_tmp); free(windowed); free(spec); free(power);
+        free(padded);
+        return NULL;
+    }
     float global_max = -1e30f;
 
-    for (int t = 0; t < n_frames; t++) {
-        int start = t * HOP_LENGTH;
-        for (int i = 0; i < N_FFT; i++)
-            windowed[i] = padded[start + i] * window[i];
-
-        for (int k = 0; k < n_freqs; k++) {
-            float re = 0, im = 0;
-            const float *cos_row = dft_cos + k * N_FFT;
-            const float *sin_row = dft_sin + k * N_FFT;
-            for (int n = 0; n < N_FFT; n++) {
-                re += windowed[n] * cos_row[n];
-                im += windowed[n] * sin_row[n];
-            }
-            power[k] = re * re + im * im;
+    for (int t0 = 0; t0 < n_frames; t0 += MEL_BLOCK) {
+        int nb = n_frames - t0 < MEL_BLOCK ? n_frames - t0 : MEL_BLOCK;
+        for (int b = 0; b < nb; b++) {
+            const float *src = padded + (size_t)(t0 + b) * HOP_LENGTH;
+            float *dst = windowed + (size_t)b * N_FFT;
+            for (int i = 0; i < N_FFT; i++) dst[i] = src[i] * window[i];
+        }
+        qwen_matmul_t(spec, windowed, dft, nb, N_FFT, 2 * N_FREQ);
+
+        for (int b = 0; b < nb; b++) {
+            const float *re = spec + (size_t)b * 2 * N_FREQ;
+            const float *im = re + N_FREQ;
+            float *pw = power + (size_t)b * n_freqs;
+            for (int k = 0; k < n_freqs; k++)
+                pw[k] = re[k] * re[k] + im[k] * im[k];
         }
 
-        for (int m = 0; m < N_MEL; m++) {
-            float sum = 0.0f;
-            const float *filt = mel_filters + (size_t)m * n_freqs;
-            for (int k = 0; k < n_freqs; k++) sum += filt[k] * power[k];
+        /* Project the whole block onto the mel filter bank at once. */
+        float *mel_blk = mel_tmp + (size_t)t0 * N_MEL;
+        qwen_matmul_t(mel_blk, power, mel_filters, nb, n_freqs, N_MEL);
+        for (int i = 0; i < nb * N_MEL; i++) {
+            float sum = mel_blk[i];
             if (sum < 1e-10f) sum = 1e-10f;
             float val = log10f(sum);
-            mel_tmp[t * N_MEL + m] = val;
+            mel_blk[i] = val;
             if (val > global_max) global_max = val;
         }
     }
@@ -384,10 +524,10 @@ float *qwen_mel_spectrogram(const float *samples, int n_samples, int *out_frames
     }
 
     free(mel_tmp);
-    free(dft_cos);
-    free(dft_sin);
+    free(windowed);
+    free(spec);
+    free(power);
     free(padded);
-    free(mel_filters);
 
     *out_frames = n_frames;
     return mel;
@@ -397,11 +537,13 @@ float *qwen_mel_spectrogram(const float *samples, int n_samples, int *out_frames
  * Live Audio: stdin reader thread for incremental streaming
  * ======================================================================== */
 
-#include <pthread.h>
-
-/* Append n_new float samples to la->samples under mutex + signal condvar. */
-static void live_audio_append(qwen_live_audio_t *la, const float *data, int n_new) {
-    if (!la || !data || n_new <= 0) return;
+/* Convert a chunk of s16le bytes to float samples and append them to
+ * la->samples under mutex + signal condvar. Samples are converted straight
+ * into the shared buffer, so no temporary float chunk is needed. */
+static void live_audio_convert_and_append(qwen_live_audio_t *la,
+                                          const uint8_t *buf, size_t n_bytes) {
+    int n_new = (int)(n_bytes / 2);
+    if (!la || !buf || n_new <= 0) return;
 
     pthread_mutex_lock(&la->mutex);
     int64_t need = la->n_samples + (int64_t)n_new;
@@ -420,25 +562,12 @@ static void live_audio_append(qwen_live_audio_t *la, const float *data, int n_ne
         la->samples = tmp;
         la->capacity = new_cap;
     }
-    memcpy(la->samples + (size_t)la->n_samples, data, (size_t)n_new * sizeof(float));
+    s16le_to_mono_f32(la->samples + (size_t)la->n_samples, buf, n_new, 1);
     la->n_samples += n_new;
     pthread_cond_signal(&la->cond);
     pthread_mutex_unlock(&la->mutex);
 }
 
-/* Convert a chunk of s16le bytes to float samples and append. */
-static void live_audio_convert_and_append(qwen_live_audio_t *la,
-                                          const uint8_t *buf, size_t n_bytes) {
-    int n_frames = (int)(n_bytes / 2);
-    if (n_frames <= 0) return;
-    float *tmp = (float *)malloc((size_t)n_frames * sizeof(float));
-    if (!tmp) return;
-    const int16_t *src = (const int16_t *)buf;
-    for (int i = 0; i < n_frames; i++) tmp[i] = src[i] / 32768.0f;
-    live_audio_append(la, tmp, n_frames);
-    free(tmp);
-}
-
 typedef struct {
     qwen_live_audio_t *la;
     int is_wav;